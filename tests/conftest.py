@@ -0,0 +1,10 @@
+"""
+Shared pytest configuration: make the `waa` package importable from the tests.
+"""
+
+import sys
+from pathlib import Path
+
+project_dir = str(Path(__file__).resolve().parent.parent)
+if project_dir not in sys.path:
+    sys.path.insert(0, project_dir)
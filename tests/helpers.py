@@ -0,0 +1,101 @@
+"""
+Shared helpers for the agent test modules: temporary workspaces, file IO and tool result lookup.
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from waa.agent import Agent
+from waa.history import ToolCallResult
+
+
+_session_roots: Dict[str, Path] = {}
+
+
+def get_temp_root() -> str:
+    """Get the parent directory for temporary files, preferring tmpfs when writable."""
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+def get_session_root(prefix: str, parent: Optional[str] = None) -> Path:
+    """
+    Get the temporary directory shared by all tests that use the given prefix.
+
+    Args:
+        prefix: Prefix of the directory name, one per test module
+        parent: Directory to create it in, only used on first call (default: the system temp directory)
+
+    Returns:
+        Path to the session directory
+    """
+    if prefix not in _session_roots:
+        _session_roots[prefix] = Path(tempfile.mkdtemp(prefix=prefix, dir=parent))
+    return _session_roots[prefix]
+
+
+def remove_session_root(prefix: str):
+    """Remove the session directory for the given prefix."""
+    session_root = _session_roots.pop(prefix, None)
+    if session_root and session_root.exists():
+        remove_tree(session_root)
+
+
+def remove_tree(path: Path):
+    """Recursively remove a directory, using the native `rm -rf` on POSIX systems."""
+    if os.name == "posix":
+        try:
+            subprocess.run(["rm", "-rf", str(path)], check=True, timeout=60)
+            return
+        except (OSError, subprocess.SubprocessError):
+            pass
+    shutil.rmtree(path)
+
+
+def read_file(file_path: Union[str, Path]) -> str:
+    """Read a whole UTF-8 file through a raw file descriptor, without buffered IO."""
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+    return b"".join(chunks).decode("utf-8")
+
+
+def write_file(file_path: Union[str, Path], content: str):
+    """Write a whole UTF-8 file through a raw file descriptor, without buffered IO."""
+    data = content.encode("utf-8")
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+
+def get_tool_results(agent: Agent) -> Dict[str, List[ToolCallResult]]:
+    """
+    Group the tool call results in the agent's history by tool name.
+
+    Args:
+        agent: The agent whose history should be scanned
+
+    Returns:
+        Mapping from tool name to its results, in call order
+    """
+    tool_results = defaultdict(list)
+    for entry in agent.history:
+        if isinstance(entry, ToolCallResult):
+            tool_results[entry.tool_name].append(entry)
+    return tool_results
@@ -5,20 +5,50 @@ Tests the agent's ability to manage files and directories using mock LLM respons
 
 import unittest
 import tempfile
-import shutil
 import json
-import time
 import os
 import sys
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 
-solution_parent_dir = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(solution_parent_dir))
+if __name__ == "__main__":
+    # Running this file directly only puts tests/ on sys.path; pytest runs use tests/conftest.py.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from waa.agent import Agent
-from waa.env import AgentEnvironment
 from waa.history import ToolCallResult
+from tests.helpers import get_session_root, get_temp_root, get_tool_results, read_file, remove_session_root, write_file
+
+
+SESSION_PREFIX = "test_fs_agent_"
+
+
+def mock_config(allowed_tools: List[str], mock_responses: List[Union[str, Dict[str, Any]]],
+                max_turns: int = 10, **extra: Any) -> Dict[str, Any]:
+    """
+    Build an agent config that drives the mock LLM through a fixed script.
+
+    Args:
+        allowed_tools: Names of the tools the agent may use
+        mock_responses: Responses the mock LLM returns, in order
+        max_turns: Maximum number of agent turns (default: 10)
+        **extra: Additional config entries (e.g. protected_files)
+
+    Returns:
+        The configuration dictionary
+    """
+    return {
+        "llm_type": "mock",
+        "max_turns": max_turns,
+        "allowed_tools": allowed_tools,
+        "mock_responses": mock_responses,
+        **extra,
+    }
+
+
+def tearDownModule():
+    """Clean up the shared temporary directory after all tests have run."""
+    remove_session_root(SESSION_PREFIX)
 
 
 class TestFSAgentRunner(unittest.TestCase):
@@ -32,13 +62,19 @@ class TestFSAgentRunner(unittest.TestCase):
         self.temp_dir = None
         self.agent = None
 
-    def tearDown(self):
-        """Clean up test environment after each test."""
-        if self.temp_dir and self.temp_dir.exists():
-            try:
-                shutil.rmtree(self.temp_dir)
-            except Exception as e:
-                print(f"Warning: Failed to remove temp directory: {e}")
+    def create_temp_dir(self) -> Path:
+        """
+        Create an empty temporary directory for the current test.
+
+        The directory lives under the module's shared session root, which is
+        removed once in tearDownModule instead of after every test.
+
+        Returns:
+            Path to the temporary directory
+        """
+        temp_dir = Path(tempfile.mkdtemp(prefix="workspace_", dir=get_session_root(SESSION_PREFIX, get_temp_root())))
+        self.temp_dir = temp_dir
+        return temp_dir
 
     def create_temp_workspace(self, config: Dict[str, Any], instruction: str = "") -> Path:
         """
@@ -51,19 +87,30 @@ class TestFSAgentRunner(unittest.TestCase):
         Returns:
             Path to the temporary workspace directory
         """
-        temp_dir = Path(tempfile.mkdtemp(prefix="test_fs_agent_"))
-        self.temp_dir = temp_dir
+        return self.create_partial_workspace(config, instruction)
+
+    def create_partial_workspace(self, config: Optional[Dict[str, Any]] = None,
+                                 instruction: Optional[str] = None) -> Path:
+        """
+        Create a temporary workspace whose .waa directory may lack config or instruction files.
+
+        Args:
+            config: Configuration dictionary to write to config.json, or None to omit it
+            instruction: Instruction text to write to instruction.md, or None to omit it
+
+        Returns:
+            Path to the temporary workspace directory
+        """
+        temp_dir = self.create_temp_dir()
 
         waa_dir = temp_dir / ".waa"
-        waa_dir.mkdir(parents=True, exist_ok=True)
+        os.mkdir(waa_dir)
 
-        config_path = waa_dir / "config.json"
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=4)
+        if config is not None:
+            write_file(waa_dir / "config.json", json.dumps(config))
 
-        instruction_path = waa_dir / "instruction.md"
-        with open(instruction_path, 'w') as f:
-            f.write(instruction)
+        if instruction is not None:
+            write_file(waa_dir / "instruction.md", instruction)
 
         return temp_dir
 
@@ -83,27 +130,33 @@ class TestFSAgentRunner(unittest.TestCase):
         agent.run()
         return agent
 
-    def assert_file_exists(self, file_path: Path, msg: Optional[str] = None):
+    def assert_file_exists(self, file_path: Union[str, Path], msg: Optional[str] = None):
         """Assert that a file exists."""
-        self.assertTrue(file_path.exists(), msg or f"File should exist: {file_path}")
+        if not os.path.exists(file_path):
+            self.fail(msg or f"File should exist: {file_path}")
 
-    def assert_file_not_exists(self, file_path: Path, msg: Optional[str] = None):
+    def assert_file_not_exists(self, file_path: Union[str, Path], msg: Optional[str] = None):
         """Assert that a file does not exist."""
-        self.assertFalse(file_path.exists(), msg or f"File should not exist: {file_path}")
+        if os.path.exists(file_path):
+            self.fail(msg or f"File should not exist: {file_path}")
 
-    def assert_file_content(self, file_path: Path, expected_content: str, msg: Optional[str] = None):
+    def assert_file_content(self, file_path: Union[str, Path], expected_content: str, msg: Optional[str] = None):
         """Assert that a file has the expected content."""
-        self.assert_file_exists(file_path)
-        actual_content = file_path.read_text(encoding='utf-8')
+        try:
+            actual_content = read_file(file_path)
+        except FileNotFoundError:
+            self.fail(msg or f"File should exist: {file_path}")
         self.assertEqual(actual_content, expected_content, msg or f"File content mismatch: {file_path}")
 
-    def assert_directory_exists(self, dir_path: Path, msg: Optional[str] = None):
+    def assert_directory_exists(self, dir_path: Union[str, Path], msg: Optional[str] = None):
         """Assert that a directory exists."""
-        self.assertTrue(dir_path.exists() and dir_path.is_dir(), msg or f"Directory should exist: {dir_path}")
+        if not os.path.isdir(dir_path):
+            self.fail(msg or f"Directory should exist: {dir_path}")
 
-    def assert_directory_not_exists(self, dir_path: Path, msg: Optional[str] = None):
+    def assert_directory_not_exists(self, dir_path: Union[str, Path], msg: Optional[str] = None):
         """Assert that a directory does not exist."""
-        self.assertFalse(dir_path.exists(), msg or f"Directory should not exist: {dir_path}")
+        if os.path.exists(dir_path):
+            self.fail(msg or f"Directory should not exist: {dir_path}")
 
 
 class TestFSAgentBasic(TestFSAgentRunner):
@@ -111,12 +164,11 @@ class TestFSAgentBasic(TestFSAgentRunner):
 
     def test_agent_initialization(self):
         """Test that the agent can be initialized with a valid config."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 1,
-            "allowed_tools": ["fs.write"],
-            "mock_responses": ["<terminate>"]
-        }
+        config = mock_config(
+            allowed_tools=["fs.write"],
+            mock_responses=["<terminate>"],
+            max_turns=1,
+        )
 
         temp_dir = self.create_temp_workspace(config, "Test instruction")
         agent = Agent(temp_dir)
@@ -130,8 +182,7 @@ class TestFSAgentBasic(TestFSAgentRunner):
 
     def test_agent_missing_config(self):
         """Test that agent raises error when config.json is missing."""
-        temp_dir = Path(tempfile.mkdtemp(prefix="test_fs_agent_"))
-        self.temp_dir = temp_dir
+        temp_dir = self.create_partial_workspace()
 
         agent = Agent(temp_dir)
         with self.assertRaises(FileNotFoundError):
@@ -139,22 +190,13 @@ class TestFSAgentBasic(TestFSAgentRunner):
 
     def test_agent_missing_instruction(self):
         """Test that agent raises error when instruction.md is missing."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 1,
-            "allowed_tools": [],
-            "mock_responses": ["<terminate>"]
-        }
-
-        temp_dir = Path(tempfile.mkdtemp(prefix="test_fs_agent_"))
-        self.temp_dir = temp_dir
+        config = mock_config(
+            allowed_tools=[],
+            mock_responses=["<terminate>"],
+            max_turns=1,
+        )
 
-        waa_dir = temp_dir / ".waa"
-        waa_dir.mkdir(parents=True, exist_ok=True)
-
-        config_path = waa_dir / "config.json"
-        with open(config_path, 'w') as f:
-            json.dump(config, f)
+        temp_dir = self.create_partial_workspace(config)
 
         agent = Agent(temp_dir)
         with self.assertRaises(FileNotFoundError):
@@ -166,59 +208,53 @@ class TestFSAgentFileWrite(TestFSAgentRunner):
 
     def test_fs_write_creates_file(self):
         """Test that fs_write tool creates a file with content."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.write"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.write", "arguments": {"path": "test.txt", "content": "Hello, World!"}}</tool_call>',
+        config = mock_config(
+            allowed_tools=["fs.write"],
+            mock_responses=[
+                {"tool": "fs.write", "arguments": {"path": "test.txt", "content": "Hello, World!"}},
                 "<terminate>"
-            ]
-        }
+            ],
+        )
 
         temp_dir = self.create_temp_workspace(config, "Create a test file")
         agent = self.run_agent(temp_dir)
 
-        test_file = temp_dir / "test.txt"
+        test_file = os.path.join(temp_dir, "test.txt")
         self.assert_file_exists(test_file)
         self.assert_file_content(test_file, "Hello, World!")
 
     def test_fs_write_creates_nested_file(self):
         """Test that fs_write creates directories if they don't exist."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.write"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.write", "arguments": {"path": "subdir/nested/test.txt", "content": "Nested content"}}</tool_call>',
+        config = mock_config(
+            allowed_tools=["fs.write"],
+            mock_responses=[
+                {"tool": "fs.write", "arguments": {"path": "subdir/nested/test.txt", "content": "Nested content"}},
                 "<terminate>"
-            ]
-        }
+            ],
+        )
 
         temp_dir = self.create_temp_workspace(config, "Create a nested file")
         agent = self.run_agent(temp_dir)
 
-        nested_file = temp_dir / "subdir" / "nested" / "test.txt"
+        nested_file = os.path.join(temp_dir, "subdir", "nested", "test.txt")
         self.assert_file_exists(nested_file)
         self.assert_file_content(nested_file, "Nested content")
 
     def test_fs_write_overwrites_file(self):
         """Test that fs_write overwrites existing files."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.write"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.write", "arguments": {"path": "test.txt", "content": "First content"}}</tool_call>',
-                '<tool_call>{"tool": "fs.write", "arguments": {"path": "test.txt", "content": "Second content"}}</tool_call>',
+        config = mock_config(
+            allowed_tools=["fs.write"],
+            mock_responses=[
+                {"tool": "fs.write", "arguments": {"path": "test.txt", "content": "First content"}},
+                {"tool": "fs.write", "arguments": {"path": "test.txt", "content": "Second content"}},
                 "<terminate>"
-            ]
-        }
+            ],
+        )
 
         temp_dir = self.create_temp_workspace(config, "Overwrite a file")
         agent = self.run_agent(temp_dir)
 
-        test_file = temp_dir / "test.txt"
+        test_file = os.path.join(temp_dir, "test.txt")
         self.assert_file_exists(test_file)
         self.assert_file_content(test_file, "Second content")
 
@@ -228,47 +264,37 @@ class TestFSAgentFileRead(TestFSAgentRunner):
 
     def test_fs_read_reads_file(self):
         """Test that fs_read tool reads a file correctly."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.write", "fs.read"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.write", "arguments": {"path": "test.txt", "content": "Test content"}}</tool_call>',
-                '<tool_call>{"tool": "fs.read", "arguments": {"path": "test.txt"}}</tool_call>',
+        config = mock_config(
+            allowed_tools=["fs.write", "fs.read"],
+            mock_responses=[
+                {"tool": "fs.write", "arguments": {"path": "test.txt", "content": "Test content"}},
+                {"tool": "fs.read", "arguments": {"path": "test.txt"}},
                 "<terminate>"
-            ]
-        }
+            ],
+        )
 
         temp_dir = self.create_temp_workspace(config, "Read a file")
         agent = self.run_agent(temp_dir)
 
-        read_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "fs.read"
-        ]
+        read_results = get_tool_results(agent)["fs.read"]
 
         self.assertEqual(len(read_results), 1)
         self.assertEqual(read_results[0].result["data"]["content"], "Test content")
 
     def test_fs_read_nonexistent_file(self):
         """Test that fs_read handles nonexistent files gracefully."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.read"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.read", "arguments": {"path": "nonexistent.txt"}}</tool_call>',
+        config = mock_config(
+            allowed_tools=["fs.read"],
+            mock_responses=[
+                {"tool": "fs.read", "arguments": {"path": "nonexistent.txt"}},
                 "<terminate>"
-            ]
-        }
+            ],
+        )
 
         temp_dir = self.create_temp_workspace(config, "Read nonexistent file")
         agent = self.run_agent(temp_dir)
 
-        read_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "fs.read"
-        ]
+        read_results = get_tool_results(agent)["fs.read"]
 
         self.assertEqual(len(read_results), 1)
         self.assertFalse(read_results[0].result["ok"])
@@ -279,44 +305,37 @@ class TestFSAgentFileEdit(TestFSAgentRunner):
 
     def test_fs_edit_edits_file(self):
         """Test that fs_edit tool edits a file correctly."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.write", "fs.edit", "fs.read"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.write", "arguments": {"path": "test.txt", "content": "Hello World"}}</tool_call>',
-                '<tool_call>{"tool": "fs.edit", "arguments": {"path": "test.txt", "old_text": "World", "new_text": "Universe"}}</tool_call>',
-                '<tool_call>{"tool": "fs.read", "arguments": {"path": "test.txt"}}</tool_call>',
+        config = mock_config(
+            allowed_tools=["fs.write", "fs.edit", "fs.read"],
+            mock_responses=[
+                {"tool": "fs.write", "arguments": {"path": "test.txt", "content": "Hello World"}},
+                {"tool": "fs.edit", "arguments": {"path": "test.txt", "old_text": "World", "new_text": "Universe"}},
+                {"tool": "fs.read", "arguments": {"path": "test.txt"}},
                 "<terminate>"
-            ]
-        }
+            ],
+        )
 
         temp_dir = self.create_temp_workspace(config, "Edit a file")
         agent = self.run_agent(temp_dir)
 
-        test_file = temp_dir / "test.txt"
+        test_file = os.path.join(temp_dir, "test.txt")
         self.assert_file_content(test_file, "Hello Universe")
 
     def test_fs_edit_text_not_found(self):
         """Test that fs_edit handles text not found error."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.write", "fs.edit"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.write", "arguments": {"path": "test.txt", "content": "Hello World"}}</tool_call>',
-                '<tool_call>{"tool": "fs.edit", "arguments": {"path": "test.txt", "old_text": "Nonexistent", "new_text": "Something"}}</tool_call>',
+        config = mock_config(
+            allowed_tools=["fs.write", "fs.edit"],
+            mock_responses=[
+                {"tool": "fs.write", "arguments": {"path": "test.txt", "content": "Hello World"}},
+                {"tool": "fs.edit", "arguments": {"path": "test.txt", "old_text": "Nonexistent", "new_text": "Something"}},
                 "<terminate>"
-            ]
-        }
+            ],
+        )
 
         temp_dir = self.create_temp_workspace(config, "Edit with text not found")
         agent = self.run_agent(temp_dir)
 
-        edit_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "fs.edit"
-        ]
+        edit_results = get_tool_results(agent)["fs.edit"]
 
         self.assertEqual(len(edit_results), 1)
         self.assertFalse(edit_results[0].result["ok"])
@@ -327,42 +346,35 @@ class TestFSAgentFileDelete(TestFSAgentRunner):
 
     def test_fs_delete_deletes_file(self):
         """Test that fs_delete tool deletes a file."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.write", "fs.delete"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.write", "arguments": {"path": "test.txt", "content": "Delete me"}}</tool_call>',
-                '<tool_call>{"tool": "fs.delete", "arguments": {"path": "test.txt"}}</tool_call>',
+        config = mock_config(
+            allowed_tools=["fs.write", "fs.delete"],
+            mock_responses=[
+                {"tool": "fs.write", "arguments": {"path": "test.txt", "content": "Delete me"}},
+                {"tool": "fs.delete", "arguments": {"path": "test.txt"}},
                 "<terminate>"
-            ]
-        }
+            ],
+        )
 
         temp_dir = self.create_temp_workspace(config, "Delete a file")
         agent = self.run_agent(temp_dir)
 
-        test_file = temp_dir / "test.txt"
+        test_file = os.path.join(temp_dir, "test.txt")
         self.assert_file_not_exists(test_file)
 
     def test_fs_delete_nonexistent_file(self):
         """Test that fs_delete handles nonexistent files."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.delete"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.delete", "arguments": {"path": "nonexistent.txt"}}</tool_call>',
+        config = mock_config(
+            allowed_tools=["fs.delete"],
+            mock_responses=[
+                {"tool": "fs.delete", "arguments": {"path": "nonexistent.txt"}},
                 "<terminate>"
-            ]
-        }
+            ],
+        )
 
         temp_dir = self.create_temp_workspace(config, "Delete nonexistent file")
         agent = self.run_agent(temp_dir)
 
-        delete_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "fs.delete"
-        ]
+        delete_results = get_tool_results(agent)["fs.delete"]
 
         self.assertEqual(len(delete_results), 1)
         self.assertFalse(delete_results[0].result["ok"])
@@ -373,77 +385,69 @@ class TestFSAgentDirectory(TestFSAgentRunner):
 
     def test_fs_mkdir_creates_directory(self):
         """Test that fs_mkdir creates a directory."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.mkdir"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.mkdir", "arguments": {"path": "new_dir"}}</tool_call>',
+        config = mock_config(
+            allowed_tools=["fs.mkdir"],
+            mock_responses=[
+                {"tool": "fs.mkdir", "arguments": {"path": "new_dir"}},
                 "<terminate>"
-            ]
-        }
+            ],
+        )
 
         temp_dir = self.create_temp_workspace(config, "Create a directory")
         agent = self.run_agent(temp_dir)
 
-        new_dir = temp_dir / "new_dir"
+        new_dir = os.path.join(temp_dir, "new_dir")
         self.assert_directory_exists(new_dir)
 
     def test_fs_mkdir_creates_nested_directory(self):
         """Test that fs_mkdir creates nested directories."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.mkdir"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.mkdir", "arguments": {"path": "parent/child/grandchild"}}</tool_call>',
+        config = mock_config(
+            allowed_tools=["fs.mkdir"],
+            mock_responses=[
+                {"tool": "fs.mkdir", "arguments": {"path": "parent/child/grandchild"}},
                 "<terminate>"
-            ]
-        }
+            ],
+        )
 
         temp_dir = self.create_temp_workspace(config, "Create nested directories")
         agent = self.run_agent(temp_dir)
 
-        nested_dir = temp_dir / "parent" / "child" / "grandchild"
+        nested_dir = os.path.join(temp_dir, "parent", "child", "grandchild")
         self.assert_directory_exists(nested_dir)
 
     def test_fs_rmdir_removes_empty_directory(self):
         """Test that fs_rmdir removes an empty directory."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.mkdir", "fs.rmdir"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.mkdir", "arguments": {"path": "test_dir"}}</tool_call>',
-                '<tool_call>{"tool": "fs.rmdir", "arguments": {"path": "test_dir"}}</tool_call>',
+        config = mock_config(
+            allowed_tools=["fs.mkdir", "fs.rmdir"],
+            mock_responses=[
+                {"tool": "fs.mkdir", "arguments": {"path": "test_dir"}},
+                {"tool": "fs.rmdir", "arguments": {"path": "test_dir"}},
                 "<terminate>"
-            ]
-        }
+            ],
+        )
 
         temp_dir = self.create_temp_workspace(config, "Remove empty directory")
         agent = self.run_agent(temp_dir)
 
-        test_dir = temp_dir / "test_dir"
+        test_dir = os.path.join(temp_dir, "test_dir")
         self.assert_directory_not_exists(test_dir)
 
     def test_fs_rmdir_removes_nonempty_directory_recursively(self):
         """Test that fs_rmdir removes a non-empty directory with recursive flag."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.mkdir", "fs.write", "fs.rmdir"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.mkdir", "arguments": {"path": "test_dir"}}</tool_call>',
-                '<tool_call>{"tool": "fs.write", "arguments": {"path": "test_dir/file.txt", "content": "content"}}</tool_call>',
-                '<tool_call>{"tool": "fs.rmdir", "arguments": {"path": "test_dir", "recursive": true}}</tool_call>',
+        config = mock_config(
+            allowed_tools=["fs.mkdir", "fs.write", "fs.rmdir"],
+            mock_responses=[
+                {"tool": "fs.mkdir", "arguments": {"path": "test_dir"}},
+                {"tool": "fs.write", "arguments": {"path": "test_dir/file.txt", "content": "content"}},
+                {"tool": "fs.rmdir", "arguments": {"path": "test_dir", "recursive": True}},
                 "<terminate>"
-            ]
-        }
+            ],
+        )
 
         temp_dir = self.create_temp_workspace(config, "Remove non-empty directory")
         agent = self.run_agent(temp_dir)
 
-        test_dir = temp_dir / "test_dir"
+        test_dir = os.path.join(temp_dir, "test_dir")
         self.assert_directory_not_exists(test_dir)
 
 
@@ -452,26 +456,21 @@ class TestFSAgentDirectoryListing(TestFSAgentRunner):
 
     def test_fs_ls_lists_directory(self):
         """Test that fs_ls lists directory contents."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.write", "fs.mkdir", "fs.ls"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.write", "arguments": {"path": "file1.txt", "content": "content1"}}</tool_call>',
-                '<tool_call>{"tool": "fs.write", "arguments": {"path": "file2.txt", "content": "content2"}}</tool_call>',
-                '<tool_call>{"tool": "fs.mkdir", "arguments": {"path": "subdir"}}</tool_call>',
-                '<tool_call>{"tool": "fs.ls", "arguments": {"path": "."}}</tool_call>',
+        config = mock_config(
+            allowed_tools=["fs.write", "fs.mkdir", "fs.ls"],
+            mock_responses=[
+                {"tool": "fs.write", "arguments": {"path": "file1.txt", "content": "content1"}},
+                {"tool": "fs.write", "arguments": {"path": "file2.txt", "content": "content2"}},
+                {"tool": "fs.mkdir", "arguments": {"path": "subdir"}},
+                {"tool": "fs.ls", "arguments": {"path": "."}},
                 "<terminate>"
-            ]
-        }
+            ],
+        )
 
         temp_dir = self.create_temp_workspace(config, "List directory contents")
         agent = self.run_agent(temp_dir)
 
-        ls_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "fs.ls"
-        ]
+        ls_results = get_tool_results(agent)["fs.ls"]
 
         self.assertEqual(len(ls_results), 1)
         entries = ls_results[0].result["data"]["entries"]
@@ -483,26 +482,21 @@ class TestFSAgentDirectoryListing(TestFSAgentRunner):
 
     def test_fs_tree_shows_tree(self):
         """Test that fs_tree shows directory tree structure."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.write", "fs.mkdir", "fs.tree"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.mkdir", "arguments": {"path": "dir1/subdir"}}</tool_call>',
-                '<tool_call>{"tool": "fs.write", "arguments": {"path": "dir1/file1.txt", "content": "content"}}</tool_call>',
-                '<tool_call>{"tool": "fs.write", "arguments": {"path": "dir1/subdir/file2.txt", "content": "content"}}</tool_call>',
-                '<tool_call>{"tool": "fs.tree", "arguments": {"path": ".", "max_depth": 3}}</tool_call>',
+        config = mock_config(
+            allowed_tools=["fs.write", "fs.mkdir", "fs.tree"],
+            mock_responses=[
+                {"tool": "fs.mkdir", "arguments": {"path": "dir1/subdir"}},
+                {"tool": "fs.write", "arguments": {"path": "dir1/file1.txt", "content": "content"}},
+                {"tool": "fs.write", "arguments": {"path": "dir1/subdir/file2.txt", "content": "content"}},
+                {"tool": "fs.tree", "arguments": {"path": ".", "max_depth": 3}},
                 "<terminate>"
-            ]
-        }
+            ],
+        )
 
         temp_dir = self.create_temp_workspace(config, "Show directory tree")
         agent = self.run_agent(temp_dir)
 
-        tree_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "fs.tree"
-        ]
+        tree_results = get_tool_results(agent)["fs.tree"]
 
         self.assertEqual(len(tree_results), 1)
         self.assertTrue(tree_results[0].result["ok"])
@@ -515,32 +509,28 @@ class TestFSAgentFullCycle(TestFSAgentRunner):
 
     def test_full_file_lifecycle(self):
         """Test complete file lifecycle: create, read, edit, delete."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 50,
-            "allowed_tools": ["fs.write", "fs.read", "fs.edit", "fs.delete"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.write", "arguments": {"path": "lifecycle.txt", "content": "Initial content"}}</tool_call>',
-                '<tool_call>{"tool": "fs.read", "arguments": {"path": "lifecycle.txt"}}</tool_call>',
-                '<tool_call>{"tool": "fs.edit", "arguments": {"path": "lifecycle.txt", "old_text": "Initial", "new_text": "Modified"}}</tool_call>',
-                '<tool_call>{"tool": "fs.read", "arguments": {"path": "lifecycle.txt"}}</tool_call>',
-                '<tool_call>{"tool": "fs.delete", "arguments": {"path": "lifecycle.txt"}}</tool_call>',
+        config = mock_config(
+            allowed_tools=["fs.write", "fs.read", "fs.edit", "fs.delete"],
+            mock_responses=[
+                {"tool": "fs.write", "arguments": {"path": "lifecycle.txt", "content": "Initial content"}},
+                {"tool": "fs.read", "arguments": {"path": "lifecycle.txt"}},
+                {"tool": "fs.edit", "arguments": {"path": "lifecycle.txt", "old_text": "Initial", "new_text": "Modified"}},
+                {"tool": "fs.read", "arguments": {"path": "lifecycle.txt"}},
+                {"tool": "fs.delete", "arguments": {"path": "lifecycle.txt"}},
                 "<terminate>"
-            ]
-        }
+            ],
+            max_turns=50,
+        )
 
         temp_dir = self.create_temp_workspace(config, "Test full file lifecycle")
         agent = self.run_agent(temp_dir)
 
         self.assertGreaterEqual(len(agent.history), 12)  # System + User + 6 mock responses + 5 tool results
 
-        lifecycle_file = temp_dir / "lifecycle.txt"
+        lifecycle_file = os.path.join(temp_dir, "lifecycle.txt")
         self.assert_file_not_exists(lifecycle_file)
 
-        read_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "fs.read"
-        ]
+        read_results = get_tool_results(agent)["fs.read"]
 
         self.assertEqual(len(read_results), 2)
         self.assertEqual(read_results[0].result["data"]["content"], "Initial content")
@@ -548,30 +538,26 @@ class TestFSAgentFullCycle(TestFSAgentRunner):
 
     def test_full_directory_lifecycle(self):
         """Test complete directory lifecycle: create, populate, list, delete."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 50,
-            "allowed_tools": ["fs.mkdir", "fs.write", "fs.ls", "fs.rmdir"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.mkdir", "arguments": {"path": "project"}}</tool_call>',
-                '<tool_call>{"tool": "fs.write", "arguments": {"path": "project/readme.md", "content": "# Project"}}</tool_call>',
-                '<tool_call>{"tool": "fs.write", "arguments": {"path": "project/index.js", "content": "console.log()"}}</tool_call>',
-                '<tool_call>{"tool": "fs.ls", "arguments": {"path": "project"}}</tool_call>',
-                '<tool_call>{"tool": "fs.rmdir", "arguments": {"path": "project", "recursive": true}}</tool_call>',
+        config = mock_config(
+            allowed_tools=["fs.mkdir", "fs.write", "fs.ls", "fs.rmdir"],
+            mock_responses=[
+                {"tool": "fs.mkdir", "arguments": {"path": "project"}},
+                {"tool": "fs.write", "arguments": {"path": "project/readme.md", "content": "# Project"}},
+                {"tool": "fs.write", "arguments": {"path": "project/index.js", "content": "console.log()"}},
+                {"tool": "fs.ls", "arguments": {"path": "project"}},
+                {"tool": "fs.rmdir", "arguments": {"path": "project", "recursive": True}},
                 "<terminate>"
-            ]
-        }
+            ],
+            max_turns=50,
+        )
 
         temp_dir = self.create_temp_workspace(config, "Test full directory lifecycle")
         agent = self.run_agent(temp_dir)
 
-        project_dir = temp_dir / "project"
+        project_dir = os.path.join(temp_dir, "project")
         self.assert_directory_not_exists(project_dir)
 
-        ls_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "fs.ls"
-        ]
+        ls_results = get_tool_results(agent)["fs.ls"]
 
         self.assertEqual(len(ls_results), 1)
         entries = ls_results[0].result["data"]["entries"]
@@ -585,23 +571,18 @@ class TestFSAgentErrorHandling(TestFSAgentRunner):
 
     def test_path_outside_main_folder(self):
         """Test that operations outside main folder are rejected."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.write"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.write", "arguments": {"path": "../outside.txt", "content": "content"}}</tool_call>',
+        config = mock_config(
+            allowed_tools=["fs.write"],
+            mock_responses=[
+                {"tool": "fs.write", "arguments": {"path": "../outside.txt", "content": "content"}},
                 "<terminate>"
-            ]
-        }
+            ],
+        )
 
         temp_dir = self.create_temp_workspace(config, "Test path outside main folder")
         agent = self.run_agent(temp_dir)
 
-        write_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "fs.write"
-        ]
+        write_results = get_tool_results(agent)["fs.write"]
 
         self.assertEqual(len(write_results), 1)
         self.assertFalse(write_results[0].result["ok"])
@@ -609,23 +590,18 @@ class TestFSAgentErrorHandling(TestFSAgentRunner):
 
     def test_delete_nonexistent_directory(self):
         """Test that deleting nonexistent directory handles error gracefully."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.rmdir"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.rmdir", "arguments": {"path": "nonexistent_dir"}}</tool_call>',
+        config = mock_config(
+            allowed_tools=["fs.rmdir"],
+            mock_responses=[
+                {"tool": "fs.rmdir", "arguments": {"path": "nonexistent_dir"}},
                 "<terminate>"
-            ]
-        }
+            ],
+        )
 
         temp_dir = self.create_temp_workspace(config, "Delete nonexistent directory")
         agent = self.run_agent(temp_dir)
 
-        rmdir_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "fs.rmdir"
-        ]
+        rmdir_results = get_tool_results(agent)["fs.rmdir"]
 
         self.assertEqual(len(rmdir_results), 1)
         self.assertFalse(rmdir_results[0].result["ok"])
@@ -634,124 +610,67 @@ class TestFSAgentErrorHandling(TestFSAgentRunner):
 class TestFSAgentProtectedFiles(TestFSAgentRunner):
     """Tests for protected files functionality."""
 
-    def test_protected_file_cannot_be_written(self):
-        """Test that protected files cannot be overwritten."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.write"],
-            "protected_files": ["protected.txt"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.write", "arguments": {"path": "protected.txt", "content": "new content"}}</tool_call>',
-                "<terminate>"
-            ]
-        }
-
-        temp_dir = self.create_temp_workspace(config, "Test protected file write")
-
-        protected_file = temp_dir / "protected.txt"
-        protected_file.write_text("original content")
-
-        agent = self.run_agent(temp_dir)
-
-        write_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "fs.write"
-        ]
+    PROTECTED_FILE_CALLS = {
+        "fs.write": {"tool": "fs.write", "arguments": {"path": "protected.txt", "content": "new content"}},
+        "fs.edit": {"tool": "fs.edit", "arguments": {"path": "protected.txt", "old_text": "original", "new_text": "modified"}},
+        "fs.delete": {"tool": "fs.delete", "arguments": {"path": "protected.txt"}},
+        "fs.read": {"tool": "fs.read", "arguments": {"path": "protected.txt"}},
+    }
 
-        self.assertEqual(len(write_results), 1)
-        self.assertFalse(write_results[0].result["ok"])
-        self.assertIn("protected", write_results[0].result["error"].lower())
+    def run_protected_file_agent(self, tool: str) -> Tuple[List[ToolCallResult], Path]:
+        """
+        Run an agent that calls a tool once on a protected file containing "original content".
 
-        self.assertEqual(protected_file.read_text(), "original content")
+        Args:
+            tool: Name of the tool to call, a key of PROTECTED_FILE_CALLS
 
-    def test_protected_file_cannot_be_edited(self):
-        """Test that protected files cannot be edited."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.edit"],
-            "protected_files": ["protected.txt"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.edit", "arguments": {"path": "protected.txt", "old_text": "original", "new_text": "modified"}}</tool_call>',
+        Returns:
+            The results of the tool call and the path to the protected file
+        """
+        config = mock_config(
+            allowed_tools=[tool],
+            mock_responses=[
+                self.PROTECTED_FILE_CALLS[tool],
                 "<terminate>"
-            ]
-        }
+            ],
+            protected_files=["protected.txt"],
+        )
 
-        temp_dir = self.create_temp_workspace(config, "Test protected file edit")
+        temp_dir = self.create_temp_workspace(config, f"Test protected file {tool}")
 
         protected_file = temp_dir / "protected.txt"
         protected_file.write_text("original content")
 
         agent = self.run_agent(temp_dir)
 
-        edit_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "fs.edit"
-        ]
-
-        self.assertEqual(len(edit_results), 1)
-        self.assertFalse(edit_results[0].result["ok"])
-        self.assertIn("protected", edit_results[0].result["error"].lower())
-
-        self.assertEqual(protected_file.read_text(), "original content")
-
-    def test_protected_file_cannot_be_deleted(self):
-        """Test that protected files cannot be deleted."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.delete"],
-            "protected_files": ["protected.txt"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.delete", "arguments": {"path": "protected.txt"}}</tool_call>',
-                "<terminate>"
-            ]
-        }
+        return get_tool_results(agent)[tool], protected_file
 
-        temp_dir = self.create_temp_workspace(config, "Test protected file delete")
+    def assert_protected_file_rejected(self, tool: str):
+        """Assert that a tool refuses to modify a protected file and leaves it untouched."""
+        results, protected_file = self.run_protected_file_agent(tool)
 
-        protected_file = temp_dir / "protected.txt"
-        protected_file.write_text("original content")
+        self.assertEqual(len(results), 1)
+        self.assertFalse(results[0].result["ok"])
+        self.assertIn("protected", results[0].result["error"].lower())
 
-        agent = self.run_agent(temp_dir)
+        self.assert_file_exists(protected_file)
+        self.assertEqual(read_file(protected_file), "original content")
 
-        delete_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "fs.delete"
-        ]
+    def test_protected_file_cannot_be_written(self):
+        """Test that protected files cannot be overwritten."""
+        self.assert_protected_file_rejected("fs.write")
 
-        self.assertEqual(len(delete_results), 1)
-        self.assertFalse(delete_results[0].result["ok"])
-        self.assertIn("protected", delete_results[0].result["error"].lower())
+    def test_protected_file_cannot_be_edited(self):
+        """Test that protected files cannot be edited."""
+        self.assert_protected_file_rejected("fs.edit")
 
-        self.assertTrue(protected_file.exists())
-        self.assertEqual(protected_file.read_text(), "original content")
+    def test_protected_file_cannot_be_deleted(self):
+        """Test that protected files cannot be deleted."""
+        self.assert_protected_file_rejected("fs.delete")
 
     def test_protected_file_can_be_read(self):
         """Test that protected files can still be read."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.read"],
-            "protected_files": ["protected.txt"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.read", "arguments": {"path": "protected.txt"}}</tool_call>',
-                "<terminate>"
-            ]
-        }
-
-        temp_dir = self.create_temp_workspace(config, "Test protected file read")
-
-        protected_file = temp_dir / "protected.txt"
-        protected_file.write_text("original content")
-
-        agent = self.run_agent(temp_dir)
-
-        read_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "fs.read"
-        ]
+        read_results, _ = self.run_protected_file_agent("fs.read")
 
         self.assertEqual(len(read_results), 1)
         self.assertTrue(read_results[0].result["ok"])
@@ -759,34 +678,24 @@ class TestFSAgentProtectedFiles(TestFSAgentRunner):
 
     def test_non_protected_file_can_be_modified(self):
         """Test that non-protected files can still be modified when protected_files is set."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["fs.write", "fs.edit", "fs.delete"],
-            "protected_files": ["protected.txt"],
-            "mock_responses": [
-                '<tool_call>{"tool": "fs.write", "arguments": {"path": "normal.txt", "content": "content"}}</tool_call>',
-                '<tool_call>{"tool": "fs.edit", "arguments": {"path": "normal.txt", "old_text": "content", "new_text": "modified"}}</tool_call>',
-                '<tool_call>{"tool": "fs.delete", "arguments": {"path": "normal.txt"}}</tool_call>',
+        config = mock_config(
+            allowed_tools=["fs.write", "fs.edit", "fs.delete"],
+            mock_responses=[
+                {"tool": "fs.write", "arguments": {"path": "normal.txt", "content": "content"}},
+                {"tool": "fs.edit", "arguments": {"path": "normal.txt", "old_text": "content", "new_text": "modified"}},
+                {"tool": "fs.delete", "arguments": {"path": "normal.txt"}},
                 "<terminate>"
-            ]
-        }
+            ],
+            protected_files=["protected.txt"],
+        )
 
         temp_dir = self.create_temp_workspace(config, "Test non-protected file")
         agent = self.run_agent(temp_dir)
 
-        write_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "fs.write"
-        ]
-        edit_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "fs.edit"
-        ]
-        delete_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "fs.delete"
-        ]
+        tool_results = get_tool_results(agent)
+        write_results = tool_results["fs.write"]
+        edit_results = tool_results["fs.edit"]
+        delete_results = tool_results["fs.delete"]
 
         self.assertEqual(len(write_results), 1)
         self.assertTrue(write_results[0].result["ok"])
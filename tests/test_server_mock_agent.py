@@ -3,22 +3,140 @@ Unit tests for the server agent functionality.
 Tests the agent's ability to manage NPM servers using mock LLM responses.
 """
 
+import contextlib
 import unittest
-import tempfile
+from unittest import mock
 import shutil
 import json
-import time
+import re
 import os
+import uuid
+import subprocess
 import sys
 from pathlib import Path
 from typing import Dict, Any, Optional
 
-solution_parent_dir = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(solution_parent_dir))
+if __name__ == "__main__":
+    # Running this file directly only puts tests/ on sys.path; pytest runs use tests/conftest.py.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from waa.agent import Agent
 from waa.env import AgentEnvironment
-from waa.history import ToolCallResult
+from waa.tools.server import NPMInitTool
+from tests.helpers import get_session_root, get_tool_results, remove_session_root, remove_tree, write_file
+
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+SESSION_PREFIX = "test_server_agent_"
+
+_npm_cache: Optional[Path] = None
+_npm_cache_error: Optional[str] = None
+
+
+def copy_fixture(name: str, dst: Path):
+    """Copy a fixture file into a workspace."""
+    shutil.copyfile(FIXTURE_DIR / name, dst)
+
+
+NODE_INDEX_PATTERN = re.compile(rb"node.*index\.js")
+
+
+def node_index_running() -> bool:
+    """
+    Check whether a `node ... index.js` process is running.
+
+    Scans /proc directly, matching the same pattern as `pgrep -f node.*index.js`
+    without spawning a child process. Falls back to pgrep where /proc is unavailable.
+    """
+    if not os.path.isdir("/proc"):
+        result = subprocess.run(
+            ["pgrep", "-f", "node.*index.js"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        return result.returncode == 0
+
+    own_pid = os.getpid()
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit() or int(entry.name) == own_pid:
+            continue
+        try:
+            with open(f"/proc/{entry.name}/cmdline", "rb") as f:
+                cmdline = f.read()
+        except OSError:
+            continue
+        if NODE_INDEX_PATTERN.search(cmdline.replace(b"\0", b" ")):
+            return True
+    return False
+
+
+class SubprocessWithoutNPMInstall:
+    """Stand-in for the subprocess module that fakes a successful `npm install` and runs any other command."""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(subprocess, name)
+
+    def run(self, args, *popenargs, **kwargs) -> subprocess.CompletedProcess:
+        if args == ["npm", "install"]:
+            return subprocess.CompletedProcess(args, 0, stdout="", stderr="")
+        return subprocess.run(args, *popenargs, **kwargs)
+
+
+def get_npm_cache() -> Path:
+    """
+    Get a workspace where `npm.init` has already installed the server dependencies.
+
+    The install runs once per test process; tests hard-link the resulting
+    node_modules tree instead of reinstalling it from scratch.
+
+    Returns:
+        Path to the cached workspace directory
+
+    Raises:
+        unittest.SkipTest: If the install failed, so the dependencies are unavailable
+    """
+    global _npm_cache, _npm_cache_error
+    if _npm_cache is None and _npm_cache_error is None:
+        cache_dir = get_session_root(SESSION_PREFIX) / "npm_cache"
+        cache_dir.mkdir()
+        tool = NPMInitTool()
+        tool.initialize(AgentEnvironment(cache_dir, {}))
+        result = tool.execute({})
+        if not result["ok"]:
+            _npm_cache_error = result["error"]
+        elif not (cache_dir / "node_modules").is_dir():
+            _npm_cache_error = result["data"]["stderr"].strip() or "node_modules was not created"
+        else:
+            _npm_cache = cache_dir
+    if _npm_cache_error is not None:
+        raise unittest.SkipTest(f"npm install failed, server dependencies are unavailable: {_npm_cache_error}")
+    return _npm_cache
+
+
+def link_npm_cache(dst: Path):
+    """Hard-link the cached node_modules tree and copy the package files into a workspace."""
+    cache_dir = get_npm_cache()
+    for name in ("package.json", "package-lock.json"):
+        if (cache_dir / name).exists():
+            shutil.copyfile(cache_dir / name, dst / name)
+
+    node_modules = cache_dir / "node_modules"
+    if os.name == "posix":
+        try:
+            subprocess.run(["cp", "-al", str(node_modules), str(dst / "node_modules")], check=True)
+            return
+        except (OSError, subprocess.CalledProcessError):
+            pass
+    shutil.copytree(node_modules, dst / "node_modules", symlinks=True, dirs_exist_ok=True)
+
+
+def tearDownModule():
+    """Remove the session directory, including the npm cache, once all tests in this module have run."""
+    global _npm_cache, _npm_cache_error
+    remove_session_root(SESSION_PREFIX)
+    _npm_cache = None
+    _npm_cache_error = None
 
 
 class TestServerAgentRunner(unittest.TestCase):
@@ -31,50 +149,79 @@ class TestServerAgentRunner(unittest.TestCase):
         """Set up test environment before each test."""
         self.temp_dir = None
         self.agent = None
+        self._stack = contextlib.ExitStack()
 
     def tearDown(self):
         """Clean up test environment after each test."""
         if self.temp_dir and self.temp_dir.exists():
             try:
-                import subprocess
-                subprocess.run(
-                    ["npm", "run", "stop"],
-                    cwd=self.temp_dir,
-                    capture_output=True,
-                    timeout=5
-                )
-            except Exception:
+                self.stop_server(self.temp_dir)
+            except OSError:
                 pass
 
+        self._stack.close()
+
+    def stop_server(self, working_dir: Path, timeout: float = 5):
+        """
+        Run `npm run stop` in a workspace, killing it if it does not exit in time.
+
+        Args:
+            working_dir: Path to the workspace directory
+            timeout: Seconds to wait before terminating the command (default: 5)
+        """
+        proc = subprocess.Popen(
+            ["npm", "run", "stop"],
+            cwd=working_dir,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.terminate()
             try:
-                shutil.rmtree(self.temp_dir)
-            except Exception as e:
-                print(f"Warning: Failed to remove temp directory: {e}")
+                proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+
+    def create_temp_dir(self) -> Path:
+        """
+        Create an empty temporary directory that is removed after the test.
+
+        Returns:
+            Path to the temporary directory
+        """
+        temp_dir = get_session_root(SESSION_PREFIX) / f"workspace_{uuid.uuid4().hex}"
+        temp_dir.mkdir()
+        self._stack.callback(remove_tree, temp_dir)
+        self.temp_dir = temp_dir
+        return temp_dir
 
-    def create_temp_workspace(self, config: Dict[str, Any], instruction: str = "") -> Path:
+    def create_temp_workspace(self, config: Dict[str, Any], instruction: str = "", npm_cache: bool = False) -> Path:
         """
         Create a temporary workspace directory with config and instruction files.
 
         Args:
             config: Configuration dictionary to write to config.json
             instruction: Instruction text to write to instruction.md
+            npm_cache: Pre-populate the workspace with the cached npm install and skip
+                the agent's own `npm install` for the rest of the test (default: False)
 
         Returns:
             Path to the temporary workspace directory
         """
-        temp_dir = Path(tempfile.mkdtemp(prefix="test_server_agent_"))
-        self.temp_dir = temp_dir
+        temp_dir = self.create_temp_dir()
 
         waa_dir = temp_dir / ".waa"
         waa_dir.mkdir(parents=True, exist_ok=True)
 
-        config_path = waa_dir / "config.json"
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=4)
+        write_file(waa_dir / "config.json", json.dumps(config, separators=(",", ":")))
+        write_file(waa_dir / "instruction.md", instruction)
 
-        instruction_path = waa_dir / "instruction.md"
-        with open(instruction_path, 'w') as f:
-            f.write(instruction)
+        if npm_cache:
+            link_npm_cache(temp_dir)
+            self._stack.enter_context(mock.patch("waa.tools.server.subprocess", SubprocessWithoutNPMInstall()))
 
         return temp_dir
 
@@ -104,23 +251,11 @@ class TestServerAgentRunner(unittest.TestCase):
 
     def assert_server_running(self, msg: Optional[str] = None):
         """Assert that the Node.js server is running."""
-        import subprocess
-        result = subprocess.run(
-            ["pgrep", "-f", "node.*index.js"],
-            capture_output=True,
-            text=True
-        )
-        self.assertEqual(result.returncode, 0, msg or "Server should be running")
+        self.assertTrue(node_index_running(), msg or "Server should be running")
 
     def assert_server_not_running(self, msg: Optional[str] = None):
         """Assert that the Node.js server is not running."""
-        import subprocess
-        result = subprocess.run(
-            ["pgrep", "-f", "node.*index.js"],
-            capture_output=True,
-            text=True
-        )
-        self.assertNotEqual(result.returncode, 0, msg or "Server should not be running")
+        self.assertFalse(node_index_running(), msg or "Server should not be running")
 
 
 class TestServerAgentBasic(TestServerAgentRunner):
@@ -147,8 +282,7 @@ class TestServerAgentBasic(TestServerAgentRunner):
 
     def test_agent_missing_config(self):
         """Test that agent raises error when config.json is missing."""
-        temp_dir = Path(tempfile.mkdtemp(prefix="test_server_agent_"))
-        self.temp_dir = temp_dir
+        temp_dir = self.create_temp_dir()
 
         agent = Agent(temp_dir)
         with self.assertRaises(FileNotFoundError):
@@ -163,15 +297,12 @@ class TestServerAgentBasic(TestServerAgentRunner):
             "mock_responses": ["<terminate>"]
         }
 
-        temp_dir = Path(tempfile.mkdtemp(prefix="test_server_agent_"))
-        self.temp_dir = temp_dir
+        temp_dir = self.create_temp_dir()
 
         waa_dir = temp_dir / ".waa"
         waa_dir.mkdir(parents=True, exist_ok=True)
 
-        config_path = waa_dir / "config.json"
-        with open(config_path, 'w') as f:
-            json.dump(config, f)
+        write_file(waa_dir / "config.json", json.dumps(config, separators=(",", ":")))
 
         agent = Agent(temp_dir)
         with self.assertRaises(FileNotFoundError):
@@ -188,7 +319,7 @@ class TestServerAgentNPMInit(TestServerAgentRunner):
             "max_turns": 10,
             "allowed_tools": ["npm.init"],
             "mock_responses": [
-                '<tool_call>{"tool": "npm.init", "arguments": {}}</tool_call>',
+                {"tool": "npm.init", "arguments": {}},
                 "<terminate>"
             ]
         }
@@ -219,32 +350,18 @@ class TestServerAgentFullCycle(TestServerAgentRunner):
             "max_turns": 50,
             "allowed_tools": ["npm.init", "npm.start", "npm.stop", "npm.status", "npm.logs"],
             "mock_responses": [
-                '<tool_call>{"tool": "npm.init", "arguments": {}}</tool_call>',
-                '<tool_call>{"tool": "npm.start", "arguments": {}}</tool_call>',
-                '<tool_call>{"tool": "npm.status", "arguments": {}}</tool_call>',
-                '<tool_call>{"tool": "npm.logs", "arguments": {"lines": 20}}</tool_call>',
-                '<tool_call>{"tool": "npm.stop", "arguments": {}}</tool_call>',
+                {"tool": "npm.init", "arguments": {}},
+                {"tool": "npm.start", "arguments": {}},
+                {"tool": "npm.status", "arguments": {}},
+                {"tool": "npm.logs", "arguments": {"lines": 20}},
+                {"tool": "npm.stop", "arguments": {}},
                 "<terminate>"
             ]
         }
 
-        temp_dir = self.create_temp_workspace(config, "Run full server lifecycle")
-
-        index_js_path = temp_dir / "index.js"
-        with open(index_js_path, 'w') as f:
-            f.write("""
-const express = require('express');
-const app = express();
-const port = 3000;
-
-app.get('/', (req, res) => {
-    res.send('Hello World!');
-});
+        temp_dir = self.create_temp_workspace(config, "Run full server lifecycle", npm_cache=True)
 
-app.listen(port, () => {
-    console.log(`Server running at http://localhost:${port}`);
-});
-""")
+        copy_fixture("index_hello.js", temp_dir / "index.js")
 
         agent = self.run_agent(temp_dir)
 
@@ -263,32 +380,23 @@ app.listen(port, () => {
             "max_turns": 50,
             "allowed_tools": ["npm.init", "npm.start", "npm.stop", "npm.status"],
             "mock_responses": [
-                '<tool_call>{"tool": "npm.init", "arguments": {}}</tool_call>',
-                '<tool_call>{"tool": "npm.status", "arguments": {}}</tool_call>',  # Should not be running
-                '<tool_call>{"tool": "npm.start", "arguments": {}}</tool_call>',
-                '<tool_call>{"tool": "npm.status", "arguments": {}}</tool_call>',  # Should be running
-                '<tool_call>{"tool": "npm.stop", "arguments": {}}</tool_call>',
-                '<tool_call>{"tool": "npm.status", "arguments": {}}</tool_call>',  # Should not be running
+                {"tool": "npm.init", "arguments": {}},
+                {"tool": "npm.status", "arguments": {}},  # Should not be running
+                {"tool": "npm.start", "arguments": {}},
+                {"tool": "npm.status", "arguments": {}},  # Should be running
+                {"tool": "npm.stop", "arguments": {}},
+                {"tool": "npm.status", "arguments": {}},  # Should not be running
                 "<terminate>"
             ]
         }
 
-        temp_dir = self.create_temp_workspace(config, "Track server status")
+        temp_dir = self.create_temp_workspace(config, "Track server status", npm_cache=True)
 
-        index_js_path = temp_dir / "index.js"
-        with open(index_js_path, 'w') as f:
-            f.write("""
-const express = require('express');
-const app = express();
-app.listen(3000, () => console.log('Server started'));
-""")
+        copy_fixture("index_listen.js", temp_dir / "index.js")
 
         agent = self.run_agent(temp_dir)
 
-        status_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "npm.status"
-        ]
+        status_results = get_tool_results(agent)["npm.status"]
 
         self.assertEqual(len(status_results), 3)
         self.assertEqual(status_results[0].result["data"]["running"], False)
@@ -305,7 +413,7 @@ class TestServerAgentErrorHandling(TestServerAgentRunner):
             "max_turns": 10,
             "allowed_tools": ["npm.start"],
             "mock_responses": [
-                '<tool_call>{"tool": "npm.start", "arguments": {}}</tool_call>',
+                {"tool": "npm.start", "arguments": {}},
                 "<terminate>"
             ]
         }
@@ -313,10 +421,7 @@ class TestServerAgentErrorHandling(TestServerAgentRunner):
         temp_dir = self.create_temp_workspace(config, "Start without init")
         agent = self.run_agent(temp_dir)
 
-        tool_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "npm.start"
-        ]
+        tool_results = get_tool_results(agent)["npm.start"]
 
         self.assertEqual(len(tool_results), 1)
         self.assertIsNotNone(tool_results[0].error or (not tool_results[0].result["ok"]))
@@ -328,7 +433,7 @@ class TestServerAgentErrorHandling(TestServerAgentRunner):
             "max_turns": 10,
             "allowed_tools": ["npm.logs"],
             "mock_responses": [
-                '<tool_call>{"tool": "npm.logs", "arguments": {"lines": 10}}</tool_call>',
+                {"tool": "npm.logs", "arguments": {"lines": 10}},
                 "<terminate>"
             ]
         }
@@ -336,10 +441,7 @@ class TestServerAgentErrorHandling(TestServerAgentRunner):
         temp_dir = self.create_temp_workspace(config, "Read logs without file")
         agent = self.run_agent(temp_dir)
 
-        tool_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "npm.logs"
-        ]
+        tool_results = get_tool_results(agent)["npm.logs"]
 
         self.assertEqual(len(tool_results), 1)
         self.assertIsNotNone(tool_results[0].result)
@@ -5,26 +5,43 @@ Test the Playwright and Supertest tools.
 import unittest
 import json
 import tempfile
-import shutil
 from pathlib import Path
 
 from waa.env import AgentEnvironment
 from waa.tools.playwright import PlaywrightInitTool, PlaywrightRunTool
 from waa.tools.supertest import SupertestInitTool, SupertestRunTool
+from tests.helpers import remove_tree
+
+
+GENERATED_FILES = ("package.json", "package-lock.json", "playwright.config.js")
+
+
+def reset_workspace(path: Path):
+    """Remove the files and the node_modules tree that the init tools create or modify in a workspace."""
+    for name in GENERATED_FILES:
+        (path / name).unlink(missing_ok=True)
+    if (path / "node_modules").exists():
+        remove_tree(path / "node_modules")
 
 
 class TestPlaywrightTools(unittest.TestCase):
     """Test Playwright tools."""
 
-    def setUp(self):
-        """Set up test environment."""
-        self.temp_dir = Path(tempfile.mkdtemp())
-        self.env = AgentEnvironment(self.temp_dir, {})
+    @classmethod
+    def setUpClass(cls):
+        """Set up a test environment shared by all tests in the class."""
+        cls.temp_dir = Path(tempfile.mkdtemp())
+        cls.env = AgentEnvironment(cls.temp_dir, {})
 
-    def tearDown(self):
-        """Clean up test environment."""
-        if self.temp_dir.exists():
-            shutil.rmtree(self.temp_dir)
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the shared test environment."""
+        if cls.temp_dir.exists():
+            remove_tree(cls.temp_dir)
+
+    def setUp(self):
+        """Remove files generated by the previous test."""
+        reset_workspace(self.temp_dir)
 
     def test_playwright_init_tool_creation(self):
         """Test that PlaywrightInitTool can be created and initialized."""
@@ -78,9 +95,11 @@ class TestPlaywrightTools(unittest.TestCase):
             json.dump(package_json, f)
 
         result = tool.execute({})
+        self.assertIsNotNone(result["data"]["package_json"], result["error"])
 
         with open(self.temp_dir / "package.json", "r") as f:
             updated = json.load(f)
+        self.assertEqual(result["data"]["package_json"], updated)
 
         self.assertIn("devDependencies", updated)
         self.assertIn("@playwright/test", updated["devDependencies"])
@@ -92,15 +111,21 @@ class TestPlaywrightTools(unittest.TestCase):
 class TestSupertestTools(unittest.TestCase):
     """Test Supertest tools."""
 
-    def setUp(self):
-        """Set up test environment."""
-        self.temp_dir = Path(tempfile.mkdtemp())
-        self.env = AgentEnvironment(self.temp_dir, {})
+    @classmethod
+    def setUpClass(cls):
+        """Set up a test environment shared by all tests in the class."""
+        cls.temp_dir = Path(tempfile.mkdtemp())
+        cls.env = AgentEnvironment(cls.temp_dir, {})
 
-    def tearDown(self):
-        """Clean up test environment."""
-        if self.temp_dir.exists():
-            shutil.rmtree(self.temp_dir)
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the shared test environment."""
+        if cls.temp_dir.exists():
+            remove_tree(cls.temp_dir)
+
+    def setUp(self):
+        """Remove files generated by the previous test."""
+        reset_workspace(self.temp_dir)
 
     def test_supertest_init_tool_creation(self):
         """Test that SupertestInitTool can be created and initialized."""
@@ -131,9 +156,11 @@ class TestSupertestTools(unittest.TestCase):
             json.dump(package_json, f)
 
         result = tool.execute({})
+        self.assertIsNotNone(result["data"]["package_json"], result["error"])
 
         with open(self.temp_dir / "package.json", "r") as f:
             updated = json.load(f)
+        self.assertEqual(result["data"]["package_json"], updated)
 
         self.assertIn("devDependencies", updated)
         self.assertIn("jest", updated["devDependencies"])
@@ -5,20 +5,27 @@ Tests the agent's ability to manage TODO items using mock LLM responses.
 
 import unittest
 import tempfile
-import shutil
 import json
-import time
 import os
 import sys
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
-solution_parent_dir = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(solution_parent_dir))
+if __name__ == "__main__":
+    # Running this file directly only puts tests/ on sys.path; pytest runs use tests/conftest.py.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from waa.agent import Agent
-from waa.env import AgentEnvironment
 from waa.history import ToolCallResult
+from tests.helpers import get_session_root, get_temp_root, get_tool_results, remove_session_root, write_file
+
+
+SESSION_PREFIX = "test_todo_agent_"
+
+
+def tearDownModule():
+    """Clean up the shared temporary directory after all tests have run."""
+    remove_session_root(SESSION_PREFIX)
 
 
 class TestTodoAgentRunner(unittest.TestCase):
@@ -30,15 +37,23 @@ class TestTodoAgentRunner(unittest.TestCase):
     def setUp(self):
         """Set up test environment before each test."""
         self.temp_dir = None
+        self.todo_file = None
         self.agent = None
 
-    def tearDown(self):
-        """Clean up test environment after each test."""
-        if self.temp_dir and self.temp_dir.exists():
-            try:
-                shutil.rmtree(self.temp_dir)
-            except Exception as e:
-                print(f"Warning: Failed to remove temp directory: {e}")
+    def create_temp_dir(self) -> Path:
+        """
+        Create an empty temporary directory for the current test.
+
+        The directory lives under the module's shared session root, which is
+        removed once in tearDownModule instead of after every test.
+
+        Returns:
+            Path to the temporary directory
+        """
+        temp_dir = Path(tempfile.mkdtemp(prefix="workspace_", dir=get_session_root(SESSION_PREFIX, get_temp_root())))
+        self.temp_dir = temp_dir
+        self.todo_file = temp_dir / ".waa" / "todo.json"
+        return temp_dir
 
     def create_temp_workspace(self, config: Dict[str, Any], instruction: str = "") -> Path:
         """
@@ -51,19 +66,13 @@ class TestTodoAgentRunner(unittest.TestCase):
         Returns:
             Path to the temporary workspace directory
         """
-        temp_dir = Path(tempfile.mkdtemp(prefix="test_todo_agent_"))
-        self.temp_dir = temp_dir
+        temp_dir = self.create_temp_dir()
 
         waa_dir = temp_dir / ".waa"
-        waa_dir.mkdir(parents=True, exist_ok=True)
-
-        config_path = waa_dir / "config.json"
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=4)
+        os.mkdir(waa_dir)
 
-        instruction_path = waa_dir / "instruction.md"
-        with open(instruction_path, 'w') as f:
-            f.write(instruction)
+        write_file(waa_dir / "config.json", json.dumps(config))
+        write_file(waa_dir / "instruction.md", instruction)
 
         return temp_dir
 
@@ -83,25 +92,49 @@ class TestTodoAgentRunner(unittest.TestCase):
         agent.run()
         return agent
 
+    def run_single_tool_call(self, tool: str, arguments: Dict[str, Any], instruction: str) -> List[ToolCallResult]:
+        """
+        Run an agent in a fresh workspace that calls one tool once and then terminates.
+
+        Args:
+            tool: Name of the tool to allow and call
+            arguments: Arguments to pass to the tool
+            instruction: Instruction text to write to instruction.md
+
+        Returns:
+            The results of calls to the tool, in call order
+        """
+        config = {
+            "llm_type": "mock",
+            "disable_logger": True,
+            "max_turns": 10,
+            "allowed_tools": [tool],
+            "mock_responses": [
+                {"tool": tool, "arguments": arguments},
+                "<terminate>"
+            ]
+        }
+
+        temp_dir = self.create_temp_workspace(config, instruction)
+        agent = self.run_agent(temp_dir)
+
+        return get_tool_results(agent)[tool]
+
     def assert_todo_file_exists(self, msg: Optional[str] = None):
         """Assert that the todo.json file exists."""
-        todo_file = self.temp_dir / ".waa" / "todo.json"
-        self.assertTrue(todo_file.exists(), msg or f"Todo file should exist: {todo_file}")
+        self.assertTrue(os.path.exists(self.todo_file), msg or f"Todo file should exist: {self.todo_file}")
 
     def assert_todo_file_not_exists(self, msg: Optional[str] = None):
         """Assert that the todo.json file does not exist."""
-        todo_file = self.temp_dir / ".waa" / "todo.json"
-        self.assertFalse(todo_file.exists(), msg or f"Todo file should not exist: {todo_file}")
+        self.assertFalse(os.path.exists(self.todo_file), msg or f"Todo file should not exist: {self.todo_file}")
 
     def get_todos_from_file(self) -> list:
         """Get the list of todos from the file."""
-        todo_file = self.temp_dir / ".waa" / "todo.json"
-        if not todo_file.exists():
+        try:
+            return json.loads(self.todo_file.read_text())
+        except FileNotFoundError:
             return []
 
-        with open(todo_file, 'r') as f:
-            return json.load(f)
-
 
 class TestTodoAgentBasic(TestTodoAgentRunner):
     """Basic tests for TODO agent functionality."""
@@ -110,6 +143,7 @@ class TestTodoAgentBasic(TestTodoAgentRunner):
         """Test that the agent can be initialized with TODO tools."""
         config = {
             "llm_type": "mock",
+            "disable_logger": True,
             "max_turns": 1,
             "allowed_tools": ["todo.add"],
             "mock_responses": ["<terminate>"]
@@ -127,8 +161,7 @@ class TestTodoAgentBasic(TestTodoAgentRunner):
 
     def test_agent_missing_config(self):
         """Test that agent raises error when config.json is missing."""
-        temp_dir = Path(tempfile.mkdtemp(prefix="test_todo_agent_"))
-        self.temp_dir = temp_dir
+        temp_dir = self.create_temp_dir()
 
         agent = Agent(temp_dir)
         with self.assertRaises(FileNotFoundError):
@@ -138,20 +171,18 @@ class TestTodoAgentBasic(TestTodoAgentRunner):
         """Test that agent raises error when instruction.md is missing."""
         config = {
             "llm_type": "mock",
+            "disable_logger": True,
             "max_turns": 1,
             "allowed_tools": [],
             "mock_responses": ["<terminate>"]
         }
 
-        temp_dir = Path(tempfile.mkdtemp(prefix="test_todo_agent_"))
-        self.temp_dir = temp_dir
+        temp_dir = self.create_temp_dir()
 
         waa_dir = temp_dir / ".waa"
-        waa_dir.mkdir(parents=True, exist_ok=True)
+        os.mkdir(waa_dir)
 
-        config_path = waa_dir / "config.json"
-        with open(config_path, 'w') as f:
-            json.dump(config, f)
+        write_file(waa_dir / "config.json", json.dumps(config))
 
         agent = Agent(temp_dir)
         with self.assertRaises(FileNotFoundError):
@@ -165,10 +196,11 @@ class TestTodoAgentAdd(TestTodoAgentRunner):
         """Test that todo_add creates a todo item."""
         config = {
             "llm_type": "mock",
+            "disable_logger": True,
             "max_turns": 10,
             "allowed_tools": ["todo.add"],
             "mock_responses": [
-                '<tool_call>{"tool": "todo.add", "arguments": {"description": "Implement login feature"}}</tool_call>',
+                {"tool": "todo.add", "arguments": {"description": "Implement login feature"}},
                 "<terminate>"
             ]
         }
@@ -188,12 +220,13 @@ class TestTodoAgentAdd(TestTodoAgentRunner):
         """Test that multiple todos can be added."""
         config = {
             "llm_type": "mock",
+            "disable_logger": True,
             "max_turns": 10,
             "allowed_tools": ["todo.add"],
             "mock_responses": [
-                '<tool_call>{"tool": "todo.add", "arguments": {"description": "Task 1"}}</tool_call>',
-                '<tool_call>{"tool": "todo.add", "arguments": {"description": "Task 2"}}</tool_call>',
-                '<tool_call>{"tool": "todo.add", "arguments": {"description": "Task 3"}}</tool_call>',
+                {"tool": "todo.add", "arguments": {"description": "Task 1"}},
+                {"tool": "todo.add", "arguments": {"description": "Task 2"}},
+                {"tool": "todo.add", "arguments": {"description": "Task 3"}},
                 "<terminate>"
             ]
         }
@@ -209,23 +242,7 @@ class TestTodoAgentAdd(TestTodoAgentRunner):
 
     def test_todo_add_without_description(self):
         """Test that todo_add handles missing description."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["todo.add"],
-            "mock_responses": [
-                '<tool_call>{"tool": "todo.add", "arguments": {}}</tool_call>',
-                "<terminate>"
-            ]
-        }
-
-        temp_dir = self.create_temp_workspace(config, "Add todo without description")
-        agent = self.run_agent(temp_dir)
-
-        add_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "todo.add"
-        ]
+        add_results = self.run_single_tool_call("todo.add", {}, "Add todo without description")
 
         self.assertEqual(len(add_results), 1)
         has_error = (add_results[0].error is not None) or (add_results[0].result and not add_results[0].result["ok"])
@@ -237,23 +254,7 @@ class TestTodoAgentList(TestTodoAgentRunner):
 
     def test_todo_list_empty(self):
         """Test that todo_list handles empty todo list."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["todo.list"],
-            "mock_responses": [
-                '<tool_call>{"tool": "todo.list", "arguments": {}}</tool_call>',
-                "<terminate>"
-            ]
-        }
-
-        temp_dir = self.create_temp_workspace(config, "List empty todos")
-        agent = self.run_agent(temp_dir)
-
-        list_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "todo.list"
-        ]
+        list_results = self.run_single_tool_call("todo.list", {}, "List empty todos")
 
         self.assertEqual(len(list_results), 1)
         self.assertTrue(list_results[0].result["ok"])
@@ -263,12 +264,13 @@ class TestTodoAgentList(TestTodoAgentRunner):
         """Test that todo_list returns all todos."""
         config = {
             "llm_type": "mock",
+            "disable_logger": True,
             "max_turns": 10,
             "allowed_tools": ["todo.add", "todo.list"],
             "mock_responses": [
-                '<tool_call>{"tool": "todo.add", "arguments": {"description": "Task 1"}}</tool_call>',
-                '<tool_call>{"tool": "todo.add", "arguments": {"description": "Task 2"}}</tool_call>',
-                '<tool_call>{"tool": "todo.list", "arguments": {}}</tool_call>',
+                {"tool": "todo.add", "arguments": {"description": "Task 1"}},
+                {"tool": "todo.add", "arguments": {"description": "Task 2"}},
+                {"tool": "todo.list", "arguments": {}},
                 "<terminate>"
             ]
         }
@@ -276,10 +278,7 @@ class TestTodoAgentList(TestTodoAgentRunner):
         temp_dir = self.create_temp_workspace(config, "List all todos")
         agent = self.run_agent(temp_dir)
 
-        list_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "todo.list"
-        ]
+        list_results = get_tool_results(agent)["todo.list"]
 
         self.assertEqual(len(list_results), 1)
         self.assertTrue(list_results[0].result["ok"])
@@ -291,13 +290,14 @@ class TestTodoAgentList(TestTodoAgentRunner):
         """Test that todo_list can filter by pending status."""
         config = {
             "llm_type": "mock",
+            "disable_logger": True,
             "max_turns": 10,
             "allowed_tools": ["todo.add", "todo.complete", "todo.list"],
             "mock_responses": [
-                '<tool_call>{"tool": "todo.add", "arguments": {"description": "Task 1"}}</tool_call>',
-                '<tool_call>{"tool": "todo.add", "arguments": {"description": "Task 2"}}</tool_call>',
-                '<tool_call>{"tool": "todo.complete", "arguments": {"id": 1}}</tool_call>',
-                '<tool_call>{"tool": "todo.list", "arguments": {"status": "pending"}}</tool_call>',
+                {"tool": "todo.add", "arguments": {"description": "Task 1"}},
+                {"tool": "todo.add", "arguments": {"description": "Task 2"}},
+                {"tool": "todo.complete", "arguments": {"id": 1}},
+                {"tool": "todo.list", "arguments": {"status": "pending"}},
                 "<terminate>"
             ]
         }
@@ -305,10 +305,7 @@ class TestTodoAgentList(TestTodoAgentRunner):
         temp_dir = self.create_temp_workspace(config, "List pending todos")
         agent = self.run_agent(temp_dir)
 
-        list_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "todo.list"
-        ]
+        list_results = get_tool_results(agent)["todo.list"]
 
         self.assertEqual(len(list_results), 1)
         self.assertEqual(list_results[0].result["data"]["count"], 1)
@@ -319,13 +316,14 @@ class TestTodoAgentList(TestTodoAgentRunner):
         """Test that todo_list can filter by completed status."""
         config = {
             "llm_type": "mock",
+            "disable_logger": True,
             "max_turns": 10,
             "allowed_tools": ["todo.add", "todo.complete", "todo.list"],
             "mock_responses": [
-                '<tool_call>{"tool": "todo.add", "arguments": {"description": "Task 1"}}</tool_call>',
-                '<tool_call>{"tool": "todo.add", "arguments": {"description": "Task 2"}}</tool_call>',
-                '<tool_call>{"tool": "todo.complete", "arguments": {"id": 1}}</tool_call>',
-                '<tool_call>{"tool": "todo.list", "arguments": {"status": "completed"}}</tool_call>',
+                {"tool": "todo.add", "arguments": {"description": "Task 1"}},
+                {"tool": "todo.add", "arguments": {"description": "Task 2"}},
+                {"tool": "todo.complete", "arguments": {"id": 1}},
+                {"tool": "todo.list", "arguments": {"status": "completed"}},
                 "<terminate>"
             ]
         }
@@ -333,10 +331,7 @@ class TestTodoAgentList(TestTodoAgentRunner):
         temp_dir = self.create_temp_workspace(config, "List completed todos")
         agent = self.run_agent(temp_dir)
 
-        list_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "todo.list"
-        ]
+        list_results = get_tool_results(agent)["todo.list"]
 
         self.assertEqual(len(list_results), 1)
         self.assertEqual(list_results[0].result["data"]["count"], 1)
@@ -352,11 +347,12 @@ class TestTodoAgentComplete(TestTodoAgentRunner):
         """Test that todo_complete marks a todo as completed."""
         config = {
             "llm_type": "mock",
+            "disable_logger": True,
             "max_turns": 10,
             "allowed_tools": ["todo.add", "todo.complete"],
             "mock_responses": [
-                '<tool_call>{"tool": "todo.add", "arguments": {"description": "Task 1"}}</tool_call>',
-                '<tool_call>{"tool": "todo.complete", "arguments": {"id": 1}}</tool_call>',
+                {"tool": "todo.add", "arguments": {"description": "Task 1"}},
+                {"tool": "todo.complete", "arguments": {"id": 1}},
                 "<terminate>"
             ]
         }
@@ -371,23 +367,7 @@ class TestTodoAgentComplete(TestTodoAgentRunner):
 
     def test_todo_complete_nonexistent(self):
         """Test that todo_complete handles nonexistent todo."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["todo.complete"],
-            "mock_responses": [
-                '<tool_call>{"tool": "todo.complete", "arguments": {"id": 999}}</tool_call>',
-                "<terminate>"
-            ]
-        }
-
-        temp_dir = self.create_temp_workspace(config, "Complete nonexistent todo")
-        agent = self.run_agent(temp_dir)
-
-        complete_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "todo.complete"
-        ]
+        complete_results = self.run_single_tool_call("todo.complete", {"id": 999}, "Complete nonexistent todo")
 
         self.assertEqual(len(complete_results), 1)
         self.assertFalse(complete_results[0].result["ok"])
@@ -400,12 +380,13 @@ class TestTodoAgentRemove(TestTodoAgentRunner):
         """Test that todo_remove deletes a todo item."""
         config = {
             "llm_type": "mock",
+            "disable_logger": True,
             "max_turns": 10,
             "allowed_tools": ["todo.add", "todo.remove"],
             "mock_responses": [
-                '<tool_call>{"tool": "todo.add", "arguments": {"description": "Task 1"}}</tool_call>',
-                '<tool_call>{"tool": "todo.add", "arguments": {"description": "Task 2"}}</tool_call>',
-                '<tool_call>{"tool": "todo.remove", "arguments": {"id": 1}}</tool_call>',
+                {"tool": "todo.add", "arguments": {"description": "Task 1"}},
+                {"tool": "todo.add", "arguments": {"description": "Task 2"}},
+                {"tool": "todo.remove", "arguments": {"id": 1}},
                 "<terminate>"
             ]
         }
@@ -419,23 +400,7 @@ class TestTodoAgentRemove(TestTodoAgentRunner):
 
     def test_todo_remove_nonexistent(self):
         """Test that todo_remove handles nonexistent todo."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["todo.remove"],
-            "mock_responses": [
-                '<tool_call>{"tool": "todo.remove", "arguments": {"id": 999}}</tool_call>',
-                "<terminate>"
-            ]
-        }
-
-        temp_dir = self.create_temp_workspace(config, "Remove nonexistent todo")
-        agent = self.run_agent(temp_dir)
-
-        remove_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "todo.remove"
-        ]
+        remove_results = self.run_single_tool_call("todo.remove", {"id": 999}, "Remove nonexistent todo")
 
         self.assertEqual(len(remove_results), 1)
         self.assertFalse(remove_results[0].result["ok"])
@@ -444,25 +409,35 @@ class TestTodoAgentRemove(TestTodoAgentRunner):
 class TestTodoAgentFullCycle(TestTodoAgentRunner):
     """Tests for full TODO lifecycle operations."""
 
+    LIFECYCLE_RESPONSES = (
+        {"tool": "todo.add", "arguments": {"description": "Task 1"}},
+        {"tool": "todo.add", "arguments": {"description": "Task 2"}},
+        {"tool": "todo.add", "arguments": {"description": "Task 3"}},
+        {"tool": "todo.list", "arguments": {}},
+        {"tool": "todo.complete", "arguments": {"id": 1}},
+        {"tool": "todo.complete", "arguments": {"id": 2}},
+        {"tool": "todo.list", "arguments": {"status": "completed"}},
+        {"tool": "todo.list", "arguments": {"status": "pending"}},
+        {"tool": "todo.remove", "arguments": {"id": 1}},
+        {"tool": "todo.list", "arguments": {}},
+        "<terminate>",
+    )
+
+    MULTIPLE_COMPLETE_RESPONSES = (
+        {"tool": "todo.add", "arguments": {"description": "Task 1"}},
+        {"tool": "todo.complete", "arguments": {"id": 1}},
+        {"tool": "todo.complete", "arguments": {"id": 1}},
+        "<terminate>",
+    )
+
     def test_full_todo_lifecycle(self):
         """Test complete todo lifecycle: add, list, complete, remove."""
         config = {
             "llm_type": "mock",
+            "disable_logger": True,
             "max_turns": 50,
             "allowed_tools": ["todo.add", "todo.list", "todo.complete", "todo.remove"],
-            "mock_responses": [
-                '<tool_call>{"tool": "todo.add", "arguments": {"description": "Task 1"}}</tool_call>',
-                '<tool_call>{"tool": "todo.add", "arguments": {"description": "Task 2"}}</tool_call>',
-                '<tool_call>{"tool": "todo.add", "arguments": {"description": "Task 3"}}</tool_call>',
-                '<tool_call>{"tool": "todo.list", "arguments": {}}</tool_call>',
-                '<tool_call>{"tool": "todo.complete", "arguments": {"id": 1}}</tool_call>',
-                '<tool_call>{"tool": "todo.complete", "arguments": {"id": 2}}</tool_call>',
-                '<tool_call>{"tool": "todo.list", "arguments": {"status": "completed"}}</tool_call>',
-                '<tool_call>{"tool": "todo.list", "arguments": {"status": "pending"}}</tool_call>',
-                '<tool_call>{"tool": "todo.remove", "arguments": {"id": 1}}</tool_call>',
-                '<tool_call>{"tool": "todo.list", "arguments": {}}</tool_call>',
-                "<terminate>"
-            ]
+            "mock_responses": self.LIFECYCLE_RESPONSES
         }
 
         temp_dir = self.create_temp_workspace(config, "Test full todo lifecycle")
@@ -476,10 +451,7 @@ class TestTodoAgentFullCycle(TestTodoAgentRunner):
         self.assertEqual(todo_by_id[3]["status"], "pending")
         self.assertNotIn(1, todo_by_id)  # ID 1 was removed
 
-        list_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "todo.list"
-        ]
+        list_results = get_tool_results(agent)["todo.list"]
 
         self.assertEqual(len(list_results), 4)
 
@@ -495,14 +467,10 @@ class TestTodoAgentFullCycle(TestTodoAgentRunner):
         """Test that completing a todo multiple times works correctly."""
         config = {
             "llm_type": "mock",
+            "disable_logger": True,
             "max_turns": 50,
             "allowed_tools": ["todo.add", "todo.complete"],
-            "mock_responses": [
-                '<tool_call>{"tool": "todo.add", "arguments": {"description": "Task 1"}}</tool_call>',
-                '<tool_call>{"tool": "todo.complete", "arguments": {"id": 1}}</tool_call>',
-                '<tool_call>{"tool": "todo.complete", "arguments": {"id": 1}}</tool_call>',
-                "<terminate>"
-            ]
+            "mock_responses": self.MULTIPLE_COMPLETE_RESPONSES
         }
 
         temp_dir = self.create_temp_workspace(config, "Complete todo multiple times")
@@ -518,35 +486,19 @@ class TestTodoAgentErrorHandling(TestTodoAgentRunner):
 
     def test_invalid_status_filter(self):
         """Test that todo_list handles invalid status filter."""
-        config = {
-            "llm_type": "mock",
-            "max_turns": 10,
-            "allowed_tools": ["todo.list"],
-            "mock_responses": [
-                '<tool_call>{"tool": "todo.list", "arguments": {"status": "invalid"}}</tool_call>',
-                "<terminate>"
-            ]
-        }
-
-        temp_dir = self.create_temp_workspace(config, "Invalid status filter")
-        agent = self.run_agent(temp_dir)
-
-        list_results = [
-            entry for entry in agent.history
-            if isinstance(entry, ToolCallResult) and entry.tool_name == "todo.list"
-        ]
+        list_results = self.run_single_tool_call("todo.list", {"status": "invalid"}, "Invalid status filter")
 
         self.assertEqual(len(list_results), 1)
         self.assertFalse(list_results[0].result["ok"])
 
     def test_todo_persistence(self):
-        """Test that todos persist across agent runs."""
+        """Test that todos persist across agent runs, with the real logger enabled."""
         config = {
             "llm_type": "mock",
             "max_turns": 10,
             "allowed_tools": ["todo.add"],
             "mock_responses": [
-                '<tool_call>{"tool": "todo.add", "arguments": {"description": "Task 1"}}</tool_call>',
+                {"tool": "todo.add", "arguments": {"description": "Task 1"}},
                 "<terminate>"
             ]
         }
@@ -562,22 +514,20 @@ class TestTodoAgentErrorHandling(TestTodoAgentRunner):
             "max_turns": 10,
             "allowed_tools": ["todo.add", "todo.list"],
             "mock_responses": [
-                '<tool_call>{"tool": "todo.list", "arguments": {}}</tool_call>',
-                '<tool_call>{"tool": "todo.add", "arguments": {"description": "Task 2"}}</tool_call>',
+                {"tool": "todo.list", "arguments": {}},
+                {"tool": "todo.add", "arguments": {"description": "Task 2"}},
                 "<terminate>"
             ]
         }
 
         config_path = temp_dir / ".waa" / "config.json"
-        with open(config_path, 'w') as f:
-            json.dump(config2, f, indent=4)
+        write_file(config_path, json.dumps(config2))
 
         log_file = temp_dir / ".waa" / "agent.log"
-        if log_file.exists():
-            log_file.unlink()
+        self.assertTrue(log_file.exists(), "The first run should keep a log file")
+        log_file.unlink()
 
-        agent2 = Agent(temp_dir)
-        agent2.run()
+        agent2 = self.run_agent(temp_dir)
 
         todos = self.get_todos_from_file()
         self.assertEqual(len(todos), 2)
@@ -1,6 +1,6 @@
 from .agent import Agent
-from .llm import LanguageModel, create_language_model
+from .llm import LanguageModel
 from .tool import Tool, ToolRegistry
 from .env import AgentEnvironment
 
-__all__ = ["Agent", "LanguageModel", "create_language_model", "ToolRegistry", "Tool", "AgentEnvironment"]
+__all__ = ["Agent", "LanguageModel", "ToolRegistry", "Tool", "AgentEnvironment"]
@@ -6,7 +6,7 @@ import json
 from .llm import LanguageModel, GeminiLanguageModel, MockLanguageModel
 from .tool import ToolRegistry
 from .history import HistoryEntry, SystemPrompt, UserInstruction, LLMResponse, ToolCallResult
-from .logger import Logger
+from .logger import Logger, NullLogger
 from .env import AgentEnvironment
 
 class Agent:
@@ -33,12 +33,12 @@ class Agent:
 
     def initialize_environment(self):
         config_path = self.working_dir / ".waa" / "config.json"
-        if not config_path.exists():
+        try:
+            with open(config_path, 'r') as f:
+                self.config = json.load(f)
+        except FileNotFoundError:
             raise FileNotFoundError(f"Config file not found: {config_path}")
 
-        with open(config_path, 'r') as f:
-            self.config = json.load(f)
-
         self.env = AgentEnvironment(self.working_dir, self.config)
         self.max_turns = self.env.get_config_value("max_turns", 50)
 
@@ -55,6 +55,10 @@ class Agent:
             raise ValueError(f"Unknown llm_type: {llm_type}. Use 'gemini' or 'mock'.")
 
     def initialize_logger(self):
+        if self.config.get("disable_logger", False):
+            self.logger = NullLogger(self.debug)
+            return
+
         log_path = self.working_dir / ".waa" / "agent.log"
         if log_path.exists():
             raise RuntimeError(f"Log file already exists: {log_path}. Remove it to start a new run.")
@@ -1,4 +1,5 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
+import json
 import os
 
 class LanguageModel:
@@ -60,16 +61,24 @@ class GeminiLanguageModel(LanguageModel):
 
 
 class MockLanguageModel(LanguageModel):
-    def __init__(self, responses: List[str] = None):
+    def __init__(self, responses: List[Union[str, Dict[str, Any]]] = None):
         super().__init__()
-        self.responses = responses or [
+        responses = responses or [
             '<tool_call>{"tool": "fs.read", "arguments": {"path": "package.json"}}</tool_call>',
             'Let me check the project structure.',
             '<tool_call>{"tool": "tests.run", "arguments": {"type": "all"}}</tool_call>',
             '<terminate>'
         ]
+        # Structured tool calls are serialized once here rather than on every turn
+        self.responses = [self.format_response(response) for response in responses]
         self.call_count = 0
 
+    @staticmethod
+    def format_response(response: Union[str, Dict[str, Any]]) -> str:
+        if isinstance(response, str):
+            return response
+        return f"<tool_call>{json.dumps(response)}</tool_call>"
+
     def generate(self, messages: List[Dict[str, Any]]) -> str:
         response = self.responses[self.call_count % len(self.responses)]
         self.call_count += 1
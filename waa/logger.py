@@ -82,3 +82,23 @@ class Logger:
 
     def log_debug(self, message: str):
         self.log(message, "DEBUG")
+
+
+class NullLogger(Logger):
+    """Logger that keeps no log file and discards every message."""
+
+    def __init__(self, debug: bool = False):
+        self.log_path = None
+        self.debug = debug
+
+    def log(self, message: str, level: str = "INFO"):
+        pass
+
+    def log_system_prompt(self, prompt: str):
+        pass
+
+    def log_user_instruction(self, instruction: str):
+        pass
+
+    def log_llm_response(self, turn: int, response: str):
+        pass
@@ -25,6 +25,7 @@ This will create a playwright.config.js file and install Playwright dependencies
 It also updates package.json with test scripts and adds Playwright to devDependencies."""
 
     def execute(self, input: Dict[str, Any]) -> Dict[str, Any]:
+        package_json = None
         try:
             playwright_config = """/**
  * Playwright Configuration
@@ -80,10 +81,10 @@ module.exports = defineConfig({
 
             package_json_path = self.main_folder / "package.json"
 
-            if package_json_path.exists():
+            try:
                 with open(package_json_path, "r") as f:
                     package_json = json.load(f)
-            else:
+            except FileNotFoundError:
                 package_json = {
                     "name": "waa-workspace",
                     "version": "1.0.0",
@@ -105,8 +106,7 @@ module.exports = defineConfig({
             package_json["scripts"]["test:ui:headed"] = "playwright test tests/ui.test.js --headed"
             package_json["scripts"]["test:ui:debug"] = "playwright test tests/ui.test.js --debug"
 
-            with open(package_json_path, "w") as f:
-                json.dump(package_json, f, indent=2)
+            package_json_path.write_text(json.dumps(package_json, indent=2))
 
             install_result = subprocess.run(
                 ["npm", "install"],
@@ -122,6 +122,7 @@ module.exports = defineConfig({
                     "data": {
                         "stdout": install_result.stdout,
                         "stderr": install_result.stderr,
+                        "package_json": package_json,
                     },
                     "error": f"npm install failed: {install_result.stderr}"
                 }
@@ -139,6 +140,7 @@ module.exports = defineConfig({
                 "data": {
                     "config_created": str(config_path),
                     "package_updated": str(package_json_path),
+                    "package_json": package_json,
                     "install_stdout": install_result.stdout,
                     "browsers_stdout": browsers_result.stdout,
                     "message": "Playwright initialized successfully"
@@ -149,13 +151,17 @@ module.exports = defineConfig({
         except subprocess.TimeoutExpired as e:
             return {
                 "ok": False,
-                "data": None,
+                "data": {
+                    "package_json": package_json,
+                },
                 "error": f"Installation timed out: {str(e)}"
             }
         except Exception as e:
             return {
                 "ok": False,
-                "data": None,
+                "data": {
+                    "package_json": package_json,
+                },
                 "error": f"Failed to initialize Playwright: {str(e)}"
             }
 
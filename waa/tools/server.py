@@ -48,8 +48,7 @@ This will initialize the server in the background."""
             }
         }
 
-        with open(self.main_folder / "package.json", "w") as f:
-            json.dump(package_json, f)
+        (self.main_folder / "package.json").write_text(json.dumps(package_json))
 
         try:
             result = subprocess.run(
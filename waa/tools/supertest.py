@@ -25,13 +25,14 @@ This will update package.json with Jest and Supertest dependencies and add test
 Jest is a JavaScript testing framework, and Supertest is used for HTTP assertions."""
 
     def execute(self, input: Dict[str, Any]) -> Dict[str, Any]:
+        package_json = None
         try:
             package_json_path = self.main_folder / "package.json"
 
-            if package_json_path.exists():
+            try:
                 with open(package_json_path, "r") as f:
                     package_json = json.load(f)
-            else:
+            except FileNotFoundError:
                 package_json = {
                     "name": "waa-workspace",
                     "version": "1.0.0",
@@ -55,8 +56,7 @@ Jest is a JavaScript testing framework, and Supertest is used for HTTP assertion
             package_json["scripts"]["test:watch"] = "jest tests/ --watch"
             package_json["scripts"]["test:coverage"] = "jest tests/ --coverage"
 
-            with open(package_json_path, "w") as f:
-                json.dump(package_json, f, indent=2)
+            package_json_path.write_text(json.dumps(package_json, indent=2))
 
             install_result = subprocess.run(
                 ["npm", "install"],
@@ -72,6 +72,7 @@ Jest is a JavaScript testing framework, and Supertest is used for HTTP assertion
                     "data": {
                         "stdout": install_result.stdout,
                         "stderr": install_result.stderr,
+                        "package_json": package_json,
                     },
                     "error": f"npm install failed: {install_result.stderr}"
                 }
@@ -80,6 +81,7 @@ Jest is a JavaScript testing framework, and Supertest is used for HTTP assertion
                 "ok": True,
                 "data": {
                     "package_updated": str(package_json_path),
+                    "package_json": package_json,
                     "install_stdout": install_result.stdout,
                     "message": "Jest and Supertest initialized successfully"
                 },
@@ -89,13 +91,17 @@ Jest is a JavaScript testing framework, and Supertest is used for HTTP assertion
         except subprocess.TimeoutExpired as e:
             return {
                 "ok": False,
-                "data": None,
+                "data": {
+                    "package_json": package_json,
+                },
                 "error": f"Installation timed out: {str(e)}"
             }
         except Exception as e:
             return {
                 "ok": False,
-                "data": None,
+                "data": {
+                    "package_json": package_json,
+                },
                 "error": f"Failed to initialize Supertest: {str(e)}"
             }
 